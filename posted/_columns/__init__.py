@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 from .columns import (
     CommentDefinition,
     UnitDefinition,
@@ -14,12 +16,14 @@ from .fields import (
     SourceFieldDefinition,
 )
 
-predefined_columns = {
-    "period": PeriodFieldDefinition(
-        name="Period",
-        description="The period that this value is reported for.",
-    ),
-}
+predefined_columns = MappingProxyType(
+    {
+        "period": PeriodFieldDefinition(
+            name="Period",
+            description="The period that this value is reported for.",
+        ),
+    }
+)
 
 
 def _base_column_src():
@@ -30,66 +34,72 @@ def _base_column_src():
     )
 
 
-base_columns_src_detail = {
-    "source_detail": CommentDefinition(
-        name="Source Detail",
-        description="Detailed information on where in the source this entry "
-        "can be found.",
-        required=True,
-    ),
-}
-
-base_columns_other = {
-    "variable": VariableDefinition(
-        name="Variable",
-        description="The reported variable.",
-        required=True,
-    ),
-    "reference_variable": VariableDefinition(
-        name="Reference Variable",
-        description="The reference variable. This is used as an addition to "
-        "the reported variable for clear, simplified, and "
-        "transparent data reporting.",
-        required=False,
-    ),
-    "value": ValueDefinition(
-        name="Value",
-        description="The reported value.",
-        required=True,
-    ),
-    "uncertainty": ValueDefinition(
-        name="Uncertainty",
-        description="The reported uncertainty.",
-        required=False,
-    ),
-    "unit": UnitDefinition(
-        name="Unit",
-        description="The reported unit that goes with the reported value.",
-        required=True,
-    ),
-    "reference_value": ValueDefinition(
-        name="Reference Value",
-        description="The reference value. This is used as an addition to the "
-        "reported variable for clear, simplified, and transparent "
-        "data reporting.",
-        required=False,
-    ),
-    "reference_unit": UnitDefinition(
-        name="Reference Unit",
-        description="The reference unit. This is used as an addition to the "
-        "reported variable to clear, simplified, and transparent "
-        "data reporting.",
-        required=False,
-    ),
-    "comment": CommentDefinition(
-        name="Comment",
-        description="A generic free text field commenting on this entry.",
-        required=False,
-    ),
-}
+base_columns_src_detail = MappingProxyType(
+    {
+        "source_detail": CommentDefinition(
+            name="Source Detail",
+            description="Detailed information on where in the source this "
+            "entry can be found.",
+            required=True,
+        ),
+    }
+)
+
+base_columns_other = MappingProxyType(
+    {
+        "variable": VariableDefinition(
+            name="Variable",
+            description="The reported variable.",
+            required=True,
+        ),
+        "reference_variable": VariableDefinition(
+            name="Reference Variable",
+            description="The reference variable. This is used as an addition "
+            "to the reported variable for clear, simplified, and "
+            "transparent data reporting.",
+            required=False,
+        ),
+        "value": ValueDefinition(
+            name="Value",
+            description="The reported value.",
+            required=True,
+        ),
+        "uncertainty": ValueDefinition(
+            name="Uncertainty",
+            description="The reported uncertainty.",
+            required=False,
+        ),
+        "unit": UnitDefinition(
+            name="Unit",
+            description="The reported unit that goes with the reported value.",
+            required=True,
+        ),
+        "reference_value": ValueDefinition(
+            name="Reference Value",
+            description="The reference value. This is used as an addition to "
+            "the reported variable for clear, simplified, and transparent "
+            "data reporting.",
+            required=False,
+        ),
+        "reference_unit": UnitDefinition(
+            name="Reference Unit",
+            description="The reference unit. This is used as an addition to "
+            "the reported variable to clear, simplified, and transparent "
+            "data reporting.",
+            required=False,
+        ),
+        "comment": CommentDefinition(
+            name="Comment",
+            description="A generic free text field commenting on this entry.",
+            required=False,
+        ),
+    }
+)
 
 base_columns = (
-    ["source"] + list(base_columns_src_detail) + list(base_columns_other)
+    "source",
+    *base_columns_src_detail,
+    *base_columns_other,
 )
 
 
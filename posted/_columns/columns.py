@@ -1,5 +1,6 @@
 """Definition and handling of columns in TEDFs."""
 
+from functools import lru_cache
 from typing import Final
 
 import numpy as np
@@ -9,6 +10,17 @@ from cet_units import ureg
 COL_TYPES: Final[list[str]] = ["field", "variable", "unit", "value", "comment"]
 
 
+@lru_cache(maxsize=4096)
+def _in_ureg(cell: str) -> bool:
+    # Wrap ureg unit check in try-except because pint raises an exception
+    # if a unit expression contains a scaling factor. Results are cached,
+    # as the same few units are repeated across many rows.
+    try:
+        return cell in ureg
+    except Exception:
+        return False
+
+
 class AbstractColumnDefinition:
     """Abstract class to store column definitions.
 
@@ -32,6 +44,8 @@ class AbstractColumnDefinition:
 
     """
 
+    __slots__ = ("_col_type", "_name", "_description", "_dtype", "_required")
+
     def __init__(
         self,
         col_type: str,
@@ -145,6 +159,8 @@ class AbstractColumnDefinition:
 class VariableDefinition(AbstractColumnDefinition):
     """Class to store definition of variable columns."""
 
+    __slots__ = ()
+
     def __init__(self, name: str, description: str, required: bool):
         """Initialise column definition.
 
@@ -174,6 +190,8 @@ class VariableDefinition(AbstractColumnDefinition):
 class UnitDefinition(AbstractColumnDefinition):
     """Class to store definition of unit columns."""
 
+    __slots__ = ()
+
     def __init__(self, name: str, description: str, required: bool):
         """Initialise column definition.
 
@@ -196,20 +214,24 @@ class UnitDefinition(AbstractColumnDefinition):
         )
 
     def _validate_values(self, s: pd.Series) -> pd.Series:
-        # Wrap ureg unit check in try-except because pint raises an exception
-        # if a unit expression contains a scaling factor.
-        def _in_ureg(cell: str):
-            try:
-                return cell in ureg
-            except:
-                return False
-
-        return s.apply(lambda cell: bool(cell) and _in_ureg(cell))
+        # Check each distinct unit only once and broadcast the result to all
+        # rows. Missing cells have code -1, which picks the appended False.
+        codes, uniques = pd.factorize(s)
+        valid = np.fromiter(
+            (bool(cell) and _in_ureg(cell) for cell in uniques),
+            dtype=bool,
+            count=len(uniques),
+        )
+        return pd.Series(
+            np.append(valid, False)[codes], index=s.index, name=s.name
+        )
 
 
 class ValueDefinition(AbstractColumnDefinition):
     """Class to store definition of unit columns."""
 
+    __slots__ = ()
+
     def __init__(self, name: str, description: str, required: bool):
         """Initialise column definition.
 
@@ -238,6 +260,8 @@ class ValueDefinition(AbstractColumnDefinition):
 class CommentDefinition(AbstractColumnDefinition):
     """Class to store definition of unit columns."""
 
+    __slots__ = ()
+
     def __init__(self, name: str, description: str, required: bool):
         """Initialise column definition.
 
@@ -1,7 +1,7 @@
 """Definition and handling of fields in TEDFs."""
 
 from enum import Enum
-from typing import Optional
+from typing import Final, Optional
 
 import numpy as np
 import pandas as pd
@@ -40,6 +40,14 @@ class AbstractFieldDefinition(AbstractColumnDefinition):
 
     """
 
+    __slots__ = (
+        "_field_type",
+        "_multi",
+        "_coded",
+        "_codes",
+        "_allowed_values",
+    )
+
     def __init__(
         self,
         field_type: str,
@@ -64,11 +72,24 @@ class AbstractFieldDefinition(AbstractColumnDefinition):
         self._field_type: str = field_type
         self._multi: bool = multi
         self._coded: bool = coded
-        self._codes: None | dict[str, str] = codes
 
-        if self._coded and not isinstance(self._codes, dict):
+        if self._coded and not isinstance(codes, dict):
             raise POSTEDException("Codes of field must be dict of strings.")
 
+        self._set_codes(codes)
+
+    def _set_codes(self, codes: None | dict[str, str]) -> None:
+        # Codes must only be set here, so that the set of allowed values,
+        # which is built once for validating columns, always matches them.
+        self._codes: None | dict[str, str] = codes
+        self._allowed_values: frozenset[str] = (
+            frozenset(self._codes)
+            | {"*", "N/S"}
+            | ({"#"} if self._field_type == "component" else set())
+            if self._coded
+            else frozenset()
+        )
+
     @property
     def field_type(self) -> str:
         """Get field type."""
@@ -87,12 +108,7 @@ class AbstractFieldDefinition(AbstractColumnDefinition):
     @property
     def allowed_values(self) -> list[str]:
         """Get list of allowed values."""
-        if not self._coded:
-            return []
-        allowed_values = list(self._codes or []) + ["*", "N/S"]
-        if self._field_type == "component":
-            allowed_values.append("#")
-        return allowed_values
+        return sorted(self._allowed_values)
 
     @property
     def default(self):
@@ -107,11 +123,11 @@ class AbstractFieldDefinition(AbstractColumnDefinition):
             return (
                 s.str.split(",", expand=True)
                 .apply(lambda col: col.str.strip())
-                .isin(self.allowed_values + [None])
+                .isin(self._allowed_values | {None})
                 .all(axis=1)
             )
         else:
-            return s.isin(self.allowed_values)
+            return s.isin(self._allowed_values)
 
     def _expand(
         self,
@@ -120,17 +136,21 @@ class AbstractFieldDefinition(AbstractColumnDefinition):
         field_vals: list[str],
         **kwargs,
     ) -> pd.DataFrame:
-        # Convert comma-separated values to multiple rows.
-        df[col_id] = df[col_id].str.split(",")
-        df = df.explode(col_id)
+        # Convert comma-separated values to multiple rows. Splitting and
+        # exploding is skipped if no cell contains a comma.
+        if df[col_id].str.contains(",", regex=False).any():
+            df[col_id] = df[col_id].str.split(",")
+            df = df.explode(col_id)
         df[col_id] = df[col_id].str.strip()
 
         # Convert asterisk into multiple values.
         locs_asterisk = df[col_id] == "*"
-        df.loc[locs_asterisk, col_id] = pd.Series(
-            [field_vals] * locs_asterisk.sum(), index=df.index[locs_asterisk]
-        )
-        df = df.explode(col_id)
+        if locs_asterisk.any():
+            df.loc[locs_asterisk, col_id] = pd.Series(
+                [field_vals] * locs_asterisk.sum(),
+                index=df.index[locs_asterisk],
+            )
+            df = df.explode(col_id)
 
         # Convert `period` column to integers.
         if isinstance(self, PeriodFieldDefinition):
@@ -230,6 +250,21 @@ class PeriodMode(Enum):
             raise ValueError(f"'{s}' is not a valid {cls.__name__}")
 
 
+def _interpolate(
+    p: np.ndarray,
+    p_upper: np.ndarray,
+    p_lower: np.ndarray,
+    v_upper: np.ndarray,
+    v_lower: np.ndarray,
+) -> np.ndarray:
+    """Interpolate values between the bracketing periods."""
+    out = np.subtract(p_upper, p)
+    out /= p_upper - p_lower
+    out *= v_upper - v_lower
+    out += v_lower
+    return out
+
+
 class PeriodFieldDefinition(AbstractFieldDefinition):
     """Class to store Period fields.
 
@@ -247,6 +282,8 @@ class PeriodFieldDefinition(AbstractFieldDefinition):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, description: str):
         """Initialise field.
 
@@ -276,7 +313,7 @@ class PeriodFieldDefinition(AbstractFieldDefinition):
                 .all(axis=1)
             )
         else:
-            return s.isin(self.allowed_values)
+            return s.isin(self._allowed_values)
 
     def _select(
         self,
@@ -294,141 +331,147 @@ class PeriodFieldDefinition(AbstractFieldDefinition):
                 **kwargs,
             )
 
+        # Nothing to select from an empty dataframe.
+        if df.empty:
+            return df.iloc[:0]
+
         # Group by identifying columns and select periods/generate time series
         # get list of groupable columns.
         group_cols = [c for c in df.columns if c not in [col_id, "value"]]
 
-        # Perform groupby and do not drop NA values.
-        grouped = df.groupby(group_cols, dropna=False)
-
-        # Create return list.
-        ret = []
-
-        # Loop over groups.
-        for keys, rows in grouped:
-            # Get rows in group.
-            rows = rows[[col_id, "value"]]
-
-            # Get a list of periods that exist
-            periods_exist = rows[col_id].unique()
-
-            # Create dataframe containing rows for all requested periods.
-            req_rows = pd.DataFrame.from_dict(
-                {
-                    f"{col_id}": field_vals,
-                    f"{col_id}_upper": [
-                        min(
-                            [ip for ip in periods_exist if ip >= p],
-                            default=np.nan,
-                        )
-                        for p in field_vals
-                    ],
-                    f"{col_id}_lower": [
-                        max(
-                            [ip for ip in periods_exist if ip <= p],
-                            default=np.nan,
-                        )
-                        for p in field_vals
-                    ],
-                }
-            )
+        # Label each group with an integer, so that groups with NA keys can
+        # be joined on, and keep one row of keys per group. Without grouping
+        # columns, all rows form a single group.
+        if group_cols:
+            group_ids = df.groupby(
+                group_cols, dropna=False, observed=True
+            ).ngroup()
+        else:
+            group_ids = pd.Series(0, index=df.index)
+        groups = (
+            df[group_cols]
+            .assign(_group=group_ids)
+            .drop_duplicates(subset="_group")
+        )
 
-            # Set missing columns from group.
-            req_rows[group_cols] = keys
+        # Get values with a float period key for joining.
+        rows = df[["value"]].assign(
+            _group=group_ids,
+            _p=df[col_id].astype(float),
+        )
 
-            # Check case.
-            cond_match = req_rows[col_id].isin(periods_exist)
-            cond_extrapolate = (
-                req_rows[f"{col_id}_upper"].isna()
-                | req_rows[f"{col_id}_lower"].isna()
+        # Get a sorted frame of periods that exist in each group.
+        periods_exist = (
+            rows[["_group", "_p"]]
+            .dropna()
+            .drop_duplicates()
+            .sort_values(by="_p", ignore_index=True)
+        )
+
+        # Create dataframe containing rows for all requested periods in all
+        # groups and find the closest existing periods above and below.
+        req_rows = (
+            groups[["_group"]]
+            .merge(
+                pd.DataFrame(
+                    {
+                        col_id: field_vals,
+                        "_order": range(len(field_vals)),
+                    }
+                ),
+                how="cross",
+            )
+            .assign(_p=lambda x: x[col_id].astype(float))
+            .sort_values(by="_p", ignore_index=True)
+        )
+        for direction, suffix in [("forward", "upper"), ("backward", "lower")]:
+            req_rows = pd.merge_asof(
+                req_rows,
+                periods_exist.assign(
+                    **{f"{col_id}_{suffix}": lambda x: x["_p"]}
+                ),
+                on="_p",
+                by="_group",
+                direction=direction,
             )
 
-            # Match.
-            rows_match = req_rows.loc[cond_match].merge(rows, on=col_id)
-
-            # Extrapolate.
-            if kwargs.get("period_mode") in [
-                PeriodMode.EXTRAPOLATE,
-                PeriodMode.INTER_AND_EXTRAPOLATION,
-            ]:
-                rows_extrapolate = (
-                    req_rows.loc[~cond_match & cond_extrapolate]
-                    .assign(
-                        period_combined=lambda x: np.where(
-                            x.notna()[f"{col_id}_upper"],
-                            x[f"{col_id}_upper"],
-                            x[f"{col_id}_lower"],
-                        ),
-                    )
-                    .merge(
-                        rows.rename(columns={col_id: f"{col_id}_combined"}),
-                        on=f"{col_id}_combined",
-                    )
-                )
-            else:
-                rows_extrapolate = None
-
-            # Interpolate.
-            if kwargs.get("period_mode") in [
-                PeriodMode.INTERPOLATE,
-                PeriodMode.INTER_AND_EXTRAPOLATION,
-            ]:
-                rows_interpolate = (
-                    req_rows.loc[~cond_match & ~cond_extrapolate]
-                    .merge(
-                        rows.rename(
-                            columns={c: f"{c}_upper" for c in rows.columns}
-                        ),
-                        on=f"{col_id}_upper",
-                    )
-                    .merge(
-                        rows.rename(
-                            columns={c: f"{c}_lower" for c in rows.columns}
-                        ),
-                        on=f"{col_id}_lower",
-                    )
-                    .assign(
-                        value=lambda row: (
-                            row["value_lower"]
-                            + (row[f"{col_id}_upper"] - row[col_id])
-                            / (row[f"{col_id}_upper"] - row[f"{col_id}_lower"])
-                            * (row["value_upper"] - row["value_lower"])
-                        )
-                    )
+        # Check case on the underlying arrays.
+        p_upper = req_rows[f"{col_id}_upper"].to_numpy()
+        p_lower = req_rows[f"{col_id}_lower"].to_numpy()
+        cond_match = p_upper == req_rows["_p"].to_numpy()
+        cond_extrapolate = np.isnan(p_upper) | np.isnan(p_lower)
+
+        # Match.
+        ret = [
+            req_rows.loc[cond_match]
+            .merge(rows, on=["_group", "_p"])
+            .assign(_case=0)
+        ]
+
+        # Extrapolate.
+        if kwargs.get("period_mode") in [
+            PeriodMode.EXTRAPOLATE,
+            PeriodMode.INTER_AND_EXTRAPOLATION,
+        ]:
+            cond = ~cond_match & cond_extrapolate
+            ret.append(
+                req_rows.loc[cond]
+                .assign(
+                    _p=np.where(
+                        np.isnan(p_upper[cond]), p_lower[cond], p_upper[cond]
+                    ),
                 )
-            else:
-                rows_interpolate = None
-
-            # Combine into one dataframe and drop unused columns.
-            rows_append = pd.concat(
-                [
-                    rows_match,
-                    rows_extrapolate,
-                    rows_interpolate,
-                ]
-            )
-            if rows_append.empty:
-                continue
-            rows_append.drop(
-                columns=[
-                    c
-                    for c in [
-                        f"{col_id}_upper",
-                        f"{col_id}_lower",
-                        f"{col_id}_combined",
-                        "value_upper",
-                        "value_lower",
-                    ]
-                    if c in rows_append.columns
-                ],
-                inplace=True,
+                .merge(rows, on=["_group", "_p"])
+                .assign(_case=1)
             )
 
-            # add to return list
-            ret.append(rows_append)
+        # Interpolate.
+        if kwargs.get("period_mode") in [
+            PeriodMode.INTERPOLATE,
+            PeriodMode.INTER_AND_EXTRAPOLATION,
+        ]:
+            ret.append(
+                req_rows.loc[~cond_match & ~cond_extrapolate]
+                .merge(
+                    rows.rename(
+                        columns={
+                            "_p": f"{col_id}_upper",
+                            "value": "value_upper",
+                        }
+                    ),
+                    on=["_group", f"{col_id}_upper"],
+                )
+                .merge(
+                    rows.rename(
+                        columns={
+                            "_p": f"{col_id}_lower",
+                            "value": "value_lower",
+                        }
+                    ),
+                    on=["_group", f"{col_id}_lower"],
+                )
+                .assign(
+                    value=lambda row: _interpolate(
+                        row["_p"].to_numpy(dtype=float),
+                        row[f"{col_id}_upper"].to_numpy(dtype=float),
+                        row[f"{col_id}_lower"].to_numpy(dtype=float),
+                        row["value_upper"].to_numpy(dtype=float),
+                        row["value_lower"].to_numpy(dtype=float),
+                    ),
+                    _case=2,
+                )
+            )
 
-        # convert return list to dataframe and return
-        return pd.concat(ret).reset_index(drop=True) if ret else df.iloc[[]]
+        # Combine into one dataframe in order of groups, cases, and requested
+        # periods, and add back the group keys.
+        ret = pd.concat(ret, ignore_index=True)
+        if ret.empty:
+            return df.iloc[:0]
+        return ret.sort_values(
+            by=["_group", "_case", "_order"], kind="stable"
+        ).merge(groups, on="_group", how="left")[
+            [col_id, *group_cols, "value"]
+        ]
 
 
 class SourceFieldDefinition(AbstractFieldDefinition):
@@ -443,6 +486,8 @@ class SourceFieldDefinition(AbstractFieldDefinition):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, description: str):
         """Initialize field."""
         super().__init__(
@@ -457,7 +502,27 @@ class SourceFieldDefinition(AbstractFieldDefinition):
 
     def set_bibtex_codes(self, codes: list[str]):
         """Set allowed codes of the field based on the BibTeX identifiers."""
-        self._codes = {c: c for c in codes}
+        self._set_codes({c: c for c in codes})
+
+
+# Required keys of custom field specs with their type, allowed values (if
+# restricted), and the error message raised if the check fails.
+_CUSTOM_FIELD_SPECS: Final[list[tuple[str, type, set | None, str]]] = [
+    (
+        "type",
+        str,
+        {"case", "component"},
+        "Field type must be provided and equal to 'case' or 'component'.",
+    ),
+    ("name", str, None, "Field name must be provided and of type string."),
+    (
+        "description",
+        str,
+        None,
+        "Field description must be provided and of type string.",
+    ),
+    ("coded", bool, None, "Field coded must be provided and of type bool."),
+]
 
 
 class CustomFieldDefinition(AbstractFieldDefinition):
@@ -470,38 +535,22 @@ class CustomFieldDefinition(AbstractFieldDefinition):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, **field_specs):
         """Initialise field.
 
         Initialise custom field definition by initialising parent class. Check
         if the field specs are of the required type and format first.
         """
-        if not (
-            "type" in field_specs
-            and isinstance(field_specs["type"], str)
-            and field_specs["type"] in ["case", "component"]
-        ):
-            raise Exception(
-                "Field type must be provided and equal to 'case' or "
-                "'component'."
-            )
-        if not (
-            "name" in field_specs and isinstance(field_specs["name"], str)
-        ):
-            raise Exception("Field name must be provided and of type string.")
-        if not (
-            "description" in field_specs
-            and isinstance(field_specs["description"], str)
-        ):
-            raise Exception(
-                "Field description must be provided and of type string."
-            )
-        if not (
-            "coded" in field_specs and isinstance(field_specs["coded"], bool)
-        ):
-            raise Exception("Field coded must be provided and of type bool.")
-        if field_specs["coded"] and not (
-            "codes" in field_specs and isinstance(field_specs["codes"], dict)
+        for key, key_type, key_allowed, message in _CUSTOM_FIELD_SPECS:
+            val = field_specs.get(key)
+            if not isinstance(val, key_type) or (
+                key_allowed is not None and val not in key_allowed
+            ):
+                raise Exception(message)
+        if field_specs["coded"] and not isinstance(
+            field_specs.get("codes"), dict
         ):
             raise Exception(
                 "Field codes must be provided and contain a dict of possible "
@@ -515,5 +564,5 @@ class CustomFieldDefinition(AbstractFieldDefinition):
             dtype="category",
             multi=True,
             coded=field_specs["coded"],
-            codes=field_specs["codes"] if "codes" in field_specs else None,
+            codes=field_specs.get("codes"),
         )
@@ -1,8 +1,35 @@
+from collections import OrderedDict
 from pathlib import Path
 
 import pandas as pd
 import yaml
 
+# Use the C-accelerated YAML loader if PyYAML was built with libyaml.
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
+
+# Parsed YAML files keyed by absolute path, together with the modification
+# time and size of the file when it was parsed. The least recently used entry
+# is evicted once the cache holds more than `_YAML_CACHE_SIZE` files.
+_YAML_CACHE_SIZE = 128
+_yaml_cache: OrderedDict[Path, tuple[int, int, dict]] = OrderedDict()
+
+
+def _clone_yaml(obj):
+    # Copy a tree loaded by the safe YAML loader. Only dicts, lists, and sets
+    # are mutable there, so all other nodes can be shared with the cache.
+    # This is much faster than `copy.deepcopy`.
+    obj_type = type(obj)
+    if obj_type is dict:
+        return {k: _clone_yaml(v) for k, v in obj.items()}
+    if obj_type is list:
+        return [_clone_yaml(v) for v in obj]
+    if obj_type is set:
+        return set(obj)
+    return obj
+
 
 def read_tedf_from_csv(fpath: Path) -> pd.DataFrame:
     """Read CSV data file.
@@ -32,6 +59,10 @@ def read_tedf_from_csv(fpath: Path) -> pd.DataFrame:
 def read_yaml(fpath: Path) -> dict:
     """Read YAML config file.
 
+    Parsed files are kept in memory and only parsed again once their
+    modification time or size changes. A copy is returned, so callers may
+    modify it.
+
     Parameters
     ----------
     fpath: str
@@ -43,8 +74,21 @@ def read_yaml(fpath: Path) -> dict:
             Dictionary containing config
 
     """
-    with open(fpath, mode="r", encoding="utf-8") as file_handle:
-        return yaml.load(
-            stream=file_handle,
-            Loader=yaml.FullLoader,
+    fpath = Path(fpath).absolute()
+    stat = fpath.stat()
+
+    cached = _yaml_cache.get(fpath)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        _yaml_cache.move_to_end(fpath)
+        contents = cached[2]
+    else:
+        contents = yaml.load(
+            stream=fpath.read_bytes(),
+            Loader=_YAMLLoader,
         )
+        _yaml_cache[fpath] = (stat.st_mtime_ns, stat.st_size, contents)
+        _yaml_cache.move_to_end(fpath)
+        if len(_yaml_cache) > _YAML_CACHE_SIZE:
+            _yaml_cache.popitem(last=False)
+
+    return _clone_yaml(contents)
@@ -1,15 +1,17 @@
 from posted.noslag import TEDF
 
-try:
-    from ipydatagrid import DataGrid
-    from ipywidgets import Button, HBox, Output, VBox
-except ModuleNotFoundError:
-    raise Exception(
-        "The `ipydatagrid` package must be installed for this feature to work."
-    )
-
 
 def build_edit_grid(tedf: TEDF):
+    # Import widget packages only when a grid is actually built.
+    try:
+        from ipydatagrid import DataGrid
+        from ipywidgets import Button, HBox, Output, VBox
+    except ModuleNotFoundError:
+        raise Exception(
+            "The `ipydatagrid` package must be installed for this feature to "
+            "work."
+        )
+
     # Create DataGrid.
     grid = DataGrid(
         tedf.raw,
@@ -1,13 +1,18 @@
 """Express activitiy-type variables relative to reference."""
 
-from re import sub
+import re
 
 import numpy as np
 import pandas as pd
 from cet_units import Q
 from numpy.linalg import solve
 
-from posted.noslag.mapping import AbstractVariableGroupMapper
+from posted.noslag.mapping import AbstractVariableGroupMapper, _match_any
+
+# Patterns for mapping (total) capacities onto their activities.
+_CAPACITY = re.compile(r"(Input|Output) Capacity")
+_TOT_CAPACITY = re.compile(r"Total (Input|Output) Capacity")
+_TOT_CAPACITY_PREFIX = re.compile(r"Total (Input|Output) Capacity\|")
 
 
 class ActivitiesMapper(AbstractVariableGroupMapper):
@@ -20,30 +25,22 @@ class ActivitiesMapper(AbstractVariableGroupMapper):
     }
 
     def _condition(self) -> pd.Series:
-        self._cond_activity = pd.concat(
-            [
-                self._df["variable"].str.match(pattern)
-                for pattern in self._activities
-            ],
-            axis=1,
-        ).any(axis=1)
+        self._cond_activity = _match_any(
+            self._df["variable"], self._activities
+        )
         self._cond_activity_change = self._cond_activity & (
             self._df["reference_variable"] != self._reference_activity
         )
 
-        self._cond_capacity = pd.concat(
-            [
-                self._df["variable"].str.match(pattern)
-                for pattern in self._capacities
-            ],
-            axis=1,
-        ).any(axis=1)
+        self._cond_capacity = _match_any(
+            self._df["variable"], self._capacities
+        )
         self._cond_capacity_change = self._cond_capacity & (
             self._df["reference_variable"] != self._reference_capacity
         )
 
         self._cond_tot_capacity = self._df["variable"].str.match(
-            r"Total (Input|Output) Capacity\|"
+            _TOT_CAPACITY_PREFIX
         )
         self._cond_tot_capacity_change = self._cond_tot_capacity & (
             self._df["variable"] != ("Total " + self._reference_capacity)
@@ -60,8 +57,7 @@ class ActivitiesMapper(AbstractVariableGroupMapper):
             self._cond_capacity_change | self._cond_tot_capacity_change
         ).any():
             return
-        self._ref_cap_activity = sub(
-            r"(Input|Output) Capacity",
+        self._ref_cap_activity = _CAPACITY.sub(
             r"\1",
             self._reference_capacity,
         )
@@ -78,6 +74,24 @@ class ActivitiesMapper(AbstractVariableGroupMapper):
             .m
         )
 
+    def _capacity_conv_factors(
+        self,
+        act_vars: pd.Series,
+        cap_vars: pd.Series,
+    ) -> pd.Series:
+        # Convert units only once for each distinct pair of variables.
+        pairs = list(zip(act_vars, cap_vars))
+        pair_factors = {
+            (var_from, var_to): (
+                Q(self._units[var_from] + "/year").to(self._units[var_to]).m
+            )
+            for var_from, var_to in set(pairs)
+        }
+        return pd.Series(
+            [pair_factors[p] for p in pairs],
+            index=act_vars.index,
+        )
+
     def _map(self, group: pd.DataFrame, cond_group: pd.Series) -> pd.DataFrame:
         cond_activity = self._cond_activity.loc[group.index]
         cond_capacity_change = self._cond_capacity_change.loc[group.index]
@@ -163,17 +177,10 @@ class ActivitiesMapper(AbstractVariableGroupMapper):
                     cond_capacity_change, "reference_variable"
                 ].rename("to")
                 act_vars = cap_vars.str.replace(
-                    r"(Input|Output) Capacity", r"\1", regex=True
+                    _CAPACITY, r"\1", regex=True
                 ).rename("from")
                 a = harmonised_activities[matrix.columns.get_indexer(act_vars)]
-                b = pd.concat([act_vars, cap_vars], axis=1).apply(
-                    lambda row: (
-                        Q(self._units[row["from"]] + "/year")
-                        .to(self._units[row["to"]])
-                        .m
-                    ),
-                    axis=1,
-                )
+                b = self._capacity_conv_factors(act_vars, cap_vars)
                 c = self._conv_factor_cap
                 group.loc[cond_capacity_change, "value"] *= a * b / c
                 group.loc[cond_capacity_change, "reference_variable"] = (
@@ -185,18 +192,11 @@ class ActivitiesMapper(AbstractVariableGroupMapper):
                     cond_tot_capacity_change, "variable"
                 ].rename("to")
                 act_vars = cap_vars.str.replace(
-                    r"Total (Input|Output) Capacity", r"\1", regex=True
+                    _TOT_CAPACITY, r"\1", regex=True
                 ).rename("from")
                 a = harmonised_activities[matrix.columns.get_indexer(act_vars)]
                 b = self._conv_factor_cap
-                c = pd.concat([act_vars, cap_vars], axis=1).apply(
-                    lambda row: (
-                        Q(self._units[row["from"]] + "/year")
-                        .to(self._units[row["to"]])
-                        .m
-                    ),
-                    axis=1,
-                )
+                c = self._capacity_conv_factors(act_vars, cap_vars)
                 group.loc[cond_tot_capacity_change, "value"] /= a * b / c
                 group.loc[cond_tot_capacity_change, "variable"] = (
                     "Total " + self._ref_cap_activity
@@ -1,47 +1,50 @@
 """Express capacity-type variables relative to reference variable."""
 
+import re
+
 import pandas as pd
 from cet_units import Q
 
 from posted.noslag.mapping import AbstractVariableMapper
 
+# Pattern of capacity variables, compiled once and reused for matching and
+# replacing.
+_CAPACITY_PREFIX = re.compile(r"^(Input|Output) Capacity\|")
+
 
 class CapacitiesToActivities(AbstractVariableMapper):
     """Express capacity-type variables relative to reference."""
 
     def _condition(self) -> pd.Series:
-        pattern = r"^(Input|Output) Capacity\|"
-        cond1 = self._df["variable"].str.match(pattern)
-        cond2 = self._df["reference_variable"].str.match(pattern)
+        cond1 = self._df["variable"].str.match(_CAPACITY_PREFIX)
+        cond2 = self._df["reference_variable"].str.match(_CAPACITY_PREFIX)
         return cond1 & cond2
 
     def _map(self, df: pd.DataFrame, cond: pd.Series) -> pd.DataFrame:
         for is_ref, col_id in enumerate(["variable", "reference_variable"]):
             old = df.loc[cond, col_id]
-            new = old.str.replace(
-                r"^(Input|Output) Capacity\|",
-                r"\1|",
-                regex=True,
-            )
-            combined = pd.concat([old, new], axis=1)
+            new = old.str.replace(_CAPACITY_PREFIX, r"\1|", regex=True)
+            pairs = list(zip(old, new))
 
-            # Insert missing units.
-            for _, row in combined.drop_duplicates().iterrows():
-                var_old, var_new = row
+            # Insert missing units and determine conversion factors once for
+            # each distinct pair of variables.
+            pair_factors = {}
+            for var_old, var_new in dict.fromkeys(pairs):
                 if var_new not in self._units:
                     self._units[var_new] = str(
                         Q(self._units[var_old] + " * year")
                         .to_reduced_units()
                         .u
                     )
-
-            conv_factors = combined.apply(
-                lambda row: (
-                    Q(self._units[row.iloc[0]] + "* year")
-                    .to(self._units[row.iloc[1]])
+                pair_factors[var_old, var_new] = (
+                    Q(self._units[var_old] + "* year")
+                    .to(self._units[var_new])
                     .m
-                ),
-                axis=1,
+                )
+
+            conv_factors = pd.Series(
+                [pair_factors[p] for p in pairs],
+                index=old.index,
             )
             df.loc[cond, col_id] = new
             if is_ref:
@@ -18,6 +18,9 @@ class FixedOPEXRelativeMapper(AbstractVariableGroupMapper):
         return self._df["variable"] == "OPEX Fixed Relative"
 
     def _prepare_units(self) -> None:
+        # rows holding CAPEX
+        self._cond_capex = self._df["variable"] == "CAPEX"
+
         if "CAPEX" not in self._units:
             return
         if "OPEX Fixed" not in self._units:
@@ -32,7 +35,7 @@ class FixedOPEXRelativeMapper(AbstractVariableGroupMapper):
         )
 
     def _map(self, group: pd.DataFrame, cond_group: pd.Series) -> pd.DataFrame:
-        cond_capex = group["variable"] == "CAPEX"
+        cond_capex = self._cond_capex.loc[group.index]
         if not cond_capex.any():
             self._add_warning("no_capex", cond_group)
             return group
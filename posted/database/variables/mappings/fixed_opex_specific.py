@@ -1,12 +1,16 @@
 """Convert fixed OPEX from activity-specific to capacity-specific."""
 
-from re import sub
+import re
 
 import pandas as pd
 from cet_units import Q
 
 from posted.noslag.mapping import AbstractVariableGroupMapper
 
+# Activity prefix of reference variables, which is renamed to the
+# corresponding capacity.
+_ACTIVITY_PREFIX = re.compile(r"^(Input|Output)")
+
 
 class FixedOPEXSpecificMapper(AbstractVariableGroupMapper):
     """Convert fixed OPEX from activity-specific to capacity-specific."""
@@ -38,9 +42,16 @@ class FixedOPEXSpecificMapper(AbstractVariableGroupMapper):
         if "OCF" in self._units:
             self._conv_factor_ocf = Q(self._units["OCF"]).to("dimensionless")
 
+        # Rows holding OCF.
+        self._cond_ocf = self._df["variable"] == "OCF"
+
+        # New reference variables and conversion factors are determined once
+        # for each distinct reference variable across all groups.
+        self._ref_vars_new: dict[str, tuple[str, float]] = {}
+
     def _map(self, group: pd.DataFrame, group_cond: pd.Series) -> pd.DataFrame:
         # Determine if OCF variable is present.
-        cond_ocf = group["variable"] == "OCF"
+        cond_ocf = self._cond_ocf.loc[group.index]
         nr = cond_ocf.sum()
 
         if nr != 1:
@@ -54,14 +65,17 @@ class FixedOPEXSpecificMapper(AbstractVariableGroupMapper):
 
         # Determine new reference variable and corresponding conversion factor.
         ref_var = group.loc[group_cond, "reference_variable"].iloc[0]
-
-        new_ref_var = sub("^(Input|Output)", r"\1 Capacity", ref_var)
-        if new_ref_var not in self._units:
-            self._units[new_ref_var] = self._units[ref_var] + "/year"
-
-        ref_conv_factor = (
-            Q(self._units[ref_var] + "/year").to(self._units[new_ref_var]).m
-        )
+        if ref_var not in self._ref_vars_new:
+            new_ref_var = _ACTIVITY_PREFIX.sub(r"\1 Capacity", ref_var)
+            if new_ref_var not in self._units:
+                self._units[new_ref_var] = self._units[ref_var] + "/year"
+            self._ref_vars_new[ref_var] = (
+                new_ref_var,
+                Q(self._units[ref_var] + "/year")
+                .to(self._units[new_ref_var])
+                .m,
+            )
+        new_ref_var, ref_conv_factor = self._ref_vars_new[ref_var]
 
         # Apply all.
         group.loc[group_cond, "variable"] = "OPEX Fixed"
@@ -10,6 +10,10 @@ from posted import POSTEDException
 MaskCondition = str | dict | Callable[[pd.Series], pd.Series]
 
 
+def _dict_to_str_cond(cond: dict) -> str:
+    return " & ".join([f"{key}=='{val}'" for key, val in cond.items()])
+
+
 def _apply_cond(df: pd.DataFrame, cond: MaskCondition) -> pd.Series:
     """Apply condition to dataframe.
 
@@ -35,8 +39,7 @@ def _apply_cond(df: pd.DataFrame, cond: MaskCondition) -> pd.Series:
     if isinstance(cond, str):
         return df.eval(cond)
     elif isinstance(cond, dict):
-        cond = " & ".join([f"{key}=='{val}'" for key, val in cond.items()])
-        return df.eval(cond)
+        return df.eval(_dict_to_str_cond(cond))
     elif isinstance(cond, Callable):
         return df.apply(cond, axis=1)
     else:
@@ -105,6 +108,17 @@ class Mask:
         if not self._weight:
             self._weight = len(self._use) * [1.0]
 
+        # convert dict conditions to expression strings once rather than on
+        # every call
+        self._where_conds = [
+            _dict_to_str_cond(w) if isinstance(w, dict) else w
+            for w in self._where
+        ]
+        self._use_conds = [
+            _dict_to_str_cond(u) if isinstance(u, dict) else u
+            for u in self._use
+        ]
+
     def matches(self, df: pd.DataFrame) -> bool:
         """Check if a mask matches a dataframe.
 
@@ -121,7 +135,7 @@ class Mask:
                 If the mask matches the dataframe
 
         """
-        for w in self._where:
+        for w in self._where_conds:
             if not _apply_cond(df, w).all():
                 return False
         return True
@@ -140,10 +154,10 @@ class Mask:
                 Dataframe with applied weights
 
         """
-        ret = pd.Series(index=df.index, data=self._other)
+        ret = np.full(len(df), self._other, dtype=float)
 
         # apply weights where the use condition matches
-        for u, w in zip(self._use, self._weight):
-            ret.loc[_apply_cond(df, u)] = w
+        for u, w in zip(self._use_conds, self._weight):
+            ret[_apply_cond(df, u).to_numpy(dtype=bool)] = w
 
-        return ret
+        return pd.Series(ret, index=df.index)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from re import escape
 from typing import TYPE_CHECKING, Optional
@@ -28,13 +29,17 @@ from .._columns import (
 from .._columns.fields import PeriodMode
 from .._read import read_tedf_from_csv, read_yaml
 from ._masking import Mask
-from .mapping import _map_variables
+from .mapping import _map_variables, _match_any
 
 if TYPE_CHECKING:
     from ipydatagrid import DataGrid
 
 
+@lru_cache(maxsize=1024)
 def _var_pattern(var_name: str, keep_token_names: bool = True) -> str:
+    # Names without wildcard tokens match literally.
+    if "?" not in var_name and "*" not in var_name:
+        return escape(var_name)
     if keep_token_names:
         return r"\|".join(
             [
@@ -59,10 +64,17 @@ def _var_pattern(var_name: str, keep_token_names: bool = True) -> str:
         )
 
 
+@lru_cache(maxsize=4096)
+def _conv_factor(unit_from: str, unit_to: str) -> float:
+    # The same few pairs of units are converted on every normalisation, so
+    # the factors are cached instead of parsing the units with pint again.
+    return ureg(unit_from).to(unit_to).m
+
+
 def _get_reference(ref_vars: pd.Series, vars: list):
     if not vars:
         return None
-    entries = ref_vars.loc[sum(ref_vars.str.fullmatch(v) for v in vars) > 0]
+    entries = ref_vars.loc[_match_any(ref_vars, vars, full=True)]
     return entries.value_counts().idxmax()
 
 
@@ -87,7 +99,8 @@ class TEDF:
     Attributes
     ----------
     raw: pd.DataFrame
-        The underlying raw data.
+        The underlying raw data. Do not modify it in place, as normalised
+        data is cached; use `update_data` instead.
     parent_variable: str
         Parent variable to assume as prefix to variables found in data.
     fields: dict
@@ -106,7 +119,8 @@ class TEDF:
     edit_data()
         Set up ipydatawidget for interactively editing raw data.
     update_data(df: pd.DataFrame)
-        Overwrite raw data from a provided dataframe.
+        Overwrite raw data from a provided dataframe and clear cached
+        normalised data.
     save_data()
         Write raw data to file (based on database_id and parent_variable).
     validate()
@@ -154,6 +168,22 @@ class TEDF:
         self._validated: pd.DataFrame | None = None
         self._mappings: list[str] | None = mappings or []
 
+        # Determine patterns of activity and capacity variables in a single
+        # pass. These only depend on the variable definitions and are reused
+        # in every select.
+        self._activities: list[str] = []
+        self._capacities: list[str] = []
+        for var_name, var_specs in self._variables.items():
+            reference = var_specs.get("reference", None)
+            if reference == "activity":
+                self._activities.append(
+                    _var_pattern(var_name, keep_token_names=False)
+                )
+            elif reference == "capacity":
+                self._capacities.append(
+                    _var_pattern(var_name, keep_token_names=False)
+                )
+
         # Combine all fields.
         source_column = _base_column_src()
         self._fields: dict[str, AbstractFieldDefinition] = {
@@ -203,6 +233,12 @@ class TEDF:
 
         self._df: pd.DataFrame = df[list(self._columns)]
 
+        # Normalised data and units keyed by the units passed to `_normalise`
+        # and the default currency. Cleared whenever the raw data is updated.
+        self._normalise_cache: dict[
+            tuple[frozenset, str], tuple[pd.DataFrame, dict[str, str]]
+        ] = {}
+
     @property
     def raw(self) -> pd.DataFrame:
         return self._df
@@ -247,41 +283,62 @@ class TEDF:
         fpath = _get_file_path(database_id, parent_variable)
         df = read_tedf_from_csv(fpath)
 
-        # Load config.
+        # Load config. The config and mask files of the TEDF only depend on
+        # the database ID, so each of them is read once. Only the predefined
+        # variable definitions are looked up in every database.
         variables = {}
         custom_columns = {}
         masks = []
         mappings: list[str] = []
 
-        for database_path in databases.values():
-            fpath = _get_file_path(database_id, parent_variable, ending="yaml")
-            if fpath.is_file():
-                fcontents = read_yaml(fpath)
-                if "variables" in fcontents:
-                    if "predefined" in fcontents["variables"]:
-                        for predefined in fcontents["variables"]["predefined"]:
-                            variables |= read_yaml(
-                                database_path
-                                / "variables"
-                                / "definitions"
-                                / (predefined + ".yaml")
-                            )
-                    if "custom" in fcontents["variables"]:
-                        variables |= fcontents["variables"]["custom"]
-                if "columns" in fcontents:
-                    custom_columns |= fcontents["columns"]
-                if "mappings" in fcontents:
-                    mappings += fcontents["mappings"]
-
-            fpath = _get_file_path(
-                database_id,
-                parent_variable,
-                ftype="masks",
-                ending="yaml",
-            )
-            if fpath.is_file():
-                fcontents = read_yaml(fpath)
-                masks += [Mask(**mask_specs) for mask_specs in fcontents]
+        # Missing files are detected when reading them rather than checking
+        # for them first, so that each file is only stat-ed once.
+        fpath = _get_file_path(database_id, parent_variable, ending="yaml")
+        try:
+            fcontents = read_yaml(fpath)
+        except FileNotFoundError:
+            pass
+        else:
+            if "variables" in fcontents:
+                # Collect all variable definitions first and combine them in
+                # a single pass, with later definitions taking precedence.
+                # Definitions of later databases override earlier ones.
+                variables_parts = [
+                    read_yaml(
+                        database_path
+                        / "variables"
+                        / "definitions"
+                        / (predefined + ".yaml")
+                    )
+                    for database_path in databases.values()
+                    for predefined in fcontents["variables"].get(
+                        "predefined", []
+                    )
+                ]
+                if "custom" in fcontents["variables"]:
+                    variables_parts.append(fcontents["variables"]["custom"])
+                variables = {
+                    var_name: var_specs
+                    for part in variables_parts
+                    for var_name, var_specs in part.items()
+                }
+            if "columns" in fcontents:
+                custom_columns |= fcontents["columns"]
+            if "mappings" in fcontents:
+                mappings += fcontents["mappings"]
+
+        fpath = _get_file_path(
+            database_id,
+            parent_variable,
+            ftype="masks",
+            ending="yaml",
+        )
+        try:
+            fcontents = read_yaml(fpath)
+        except FileNotFoundError:
+            pass
+        else:
+            masks += [Mask(**mask_specs) for mask_specs in fcontents]
 
         custom_fields, custom_comments = _read_fields_comments(custom_columns)
 
@@ -303,6 +360,7 @@ class TEDF:
 
     def update_data(self, df: pd.DataFrame):
         self._df = df
+        self._normalise_cache.clear()
 
     def save_data(self):
         if self._database_id is None or self._parent_variable is None:
@@ -328,9 +386,13 @@ class TEDF:
             sources = list(load_sources(database_id=self._database_id).entries)
             self._fields["source"].set_bibtex_codes(sources)
 
-        self._validated = pd.DataFrame()
-        for col_id, col_def in self._columns.items():
-            self._validated[col_id] = col_def.validate(self._df[col_id])
+        self._validated = pd.DataFrame(
+            {
+                col_id: col_def.validate(self._df[col_id])
+                for col_id, col_def in self._columns.items()
+            },
+            index=self._df.index,
+        )
 
     def _prepare(self) -> pd.DataFrame:
         df = self._df.mask(self._df == "")
@@ -368,25 +430,12 @@ class TEDF:
         """
         normalised, units = self._normalise(units)
 
-        # Insert unit, reference value, and reference unit.
-        normalised.insert(
-            normalised.columns.tolist().index("uncertainty") + 1,
-            "unit",
-            np.nan,
-        )
-        normalised["unit"] = normalised["variable"].map(units)
-        normalised.insert(
-            normalised.columns.tolist().index("unit") + 1,
-            "reference_value",
-            1.0,
-        )
-        normalised.insert(
-            normalised.columns.tolist().index("reference_value") + 1,
-            "reference_unit",
-            np.nan,
-        )
-        normalised["reference_unit"] = normalised["reference_variable"].map(
-            units
+        # Add unit, reference value, and reference unit in one go. They are
+        # moved into position when ordering the columns below.
+        normalised = normalised.assign(
+            unit=normalised["variable"].map(units),
+            reference_value=1.0,
+            reference_unit=normalised["reference_variable"].map(units),
         )
 
         # Prepend parent variable.
@@ -408,6 +457,19 @@ class TEDF:
 
     def _normalise(
         self, units: dict[str, str] | None
+    ) -> tuple[pd.DataFrame, dict[str, str]]:
+        # Repeated selections with the same units reuse the normalised data.
+        # The key includes the default currency, as it is read when
+        # normalising and can be changed by users. Copies are returned, as
+        # callers modify both the data and the units.
+        key = (frozenset((units or {}).items()), defaults["currency"])
+        if key not in self._normalise_cache:
+            self._normalise_cache[key] = self._normalise_uncached(units)
+        normalised, units = self._normalise_cache[key]
+        return normalised.copy(), units.copy()
+
+    def _normalise_uncached(
+        self, units: dict[str, str] | None
     ) -> tuple[pd.DataFrame, dict[str, str]]:
         units = units or {}
         prepared = self._prepare()
@@ -427,33 +489,37 @@ class TEDF:
             ]
         )
 
-        # Determine default units for all variables.
+        # Determine default units for all variables as the most frequent unit
+        # of each variable. Counting (variable, unit) pairs avoids calling
+        # `mode` once per variable; ties go to the first unit in sort order.
         currencies_pattern = rf"({'|'.join(ureg.currencies)})_\d{{4}}"
-        units = (
+        unit_counts = (
             df_vars_units.assign(
                 unit=df_vars_units["unit"].str.replace(
                     currencies_pattern, defaults["currency"], regex=True
                 ),
             )
-            .groupby("variable")["unit"]
-            .agg(lambda x: x.mode()[0])
-            .to_dict()
-        ) | units
-
-        # Determine unit conversion factors.
-        conv_factors = (
-            df_vars_units.groupby("variable")["unit"]
-            .apply(
-                lambda group: pd.Series(
-                    {
-                        u: ureg(u).to(units[group.name]).m
-                        for u in group.unique()
-                    }
-                )
-            )
-            .reset_index()
-            .rename(columns={"unit": "conv_factor", "level_1": "unit"})
+            .groupby(["variable", "unit"])
+            .size()
+        )
+        units = (
+            dict(unit_counts.groupby(level="variable").idxmax().tolist())
+            | units
+        )
+
+        # Determine unit conversion factors. Each distinct pair of original
+        # and target unit is only converted once, even if it occurs for
+        # several variables.
+        conv_factors = df_vars_units.dropna(subset="variable").drop_duplicates(
+            ignore_index=True
         )
+        target_units = conv_factors["variable"].map(units)
+        unit_pairs = list(zip(conv_factors["unit"], target_units))
+        pair_factors = {
+            (u, u_target): _conv_factor(u, u_target)
+            for u, u_target in set(unit_pairs)
+        }
+        conv_factors["conv_factor"] = [pair_factors[p] for p in unit_pairs]
 
         # For now, we simply assume that no column `conv_factor` exists.
         assert (
@@ -477,26 +543,25 @@ class TEDF:
         else:
             normalised = normalised.assign(reference_conv_factor=1.0)
 
-        # Assign updated values.
-        normalised = normalised.assign(
-            factor=lambda df: (
-                df["conv_factor"]
-                / (df["reference_value"] * df["reference_conv_factor"]).where(
-                    df["reference_variable"].notnull(),
-                    other=1.0,
-                )
-            ),
-            value=lambda df: df["value"] * df["factor"],
-            uncertainty=lambda df: df["uncertainty"] * df["factor"],
-        ).drop(
+        # Assign updated values. The factors are computed on the underlying
+        # arrays, so no temporary columns are added to the dataframe.
+        factor = normalised["conv_factor"].to_numpy() / np.where(
+            normalised["reference_variable"].notnull().to_numpy(),
+            normalised["reference_value"].to_numpy()
+            * normalised["reference_conv_factor"].to_numpy(),
+            1.0,
+        )
+        normalised = normalised.drop(
             columns=[
-                "factor",
                 "conv_factor",
                 "reference_conv_factor",
                 "reference_value",
                 "unit",
                 "reference_unit",
             ]
+        ).assign(
+            value=normalised["value"].to_numpy() * factor,
+            uncertainty=normalised["uncertainty"].to_numpy() * factor,
         )
 
         # Return normalised data and variable units.
@@ -581,6 +646,15 @@ class TEDF:
         expand_not_specified: bool | list[str],
         **field_vals_select,
     ) -> tuple[pd.DataFrame, dict[str, str], dict[str, str]]:
+        # Raise exception if fields given as arguments are not in the columns.
+        # This is checked before normalising to fail early.
+        for field_id in field_vals_select:
+            if field_id not in self._fields:
+                raise Exception(
+                    f"Field '{field_id}' does not exist and cannot be used "
+                    f"for selection."
+                )
+
         # Start from normalised data.
         normalised, units = self._normalise(units)
         selected = normalised
@@ -592,14 +666,6 @@ class TEDF:
             inplace=True,
         )
 
-        # Raise exception if fields given as arguments are not in the columns.
-        for field_id in field_vals_select:
-            if not any(field_id == col_id for col_id in self._fields):
-                raise Exception(
-                    f"Field '{field_id}' does not exist and cannot be used "
-                    f"for selection."
-                )
-
         # Order fields before selection. Columns of type PeriodFieldDefinition
         # must be selected last due to the interpolation.
         fields_select_order = list(set(field_vals_select) | set(self._fields))
@@ -657,20 +723,12 @@ class TEDF:
                 inplace=True,
             )
 
-        # Determine activity and capacity variables and their references.
-        activities = [
-            _var_pattern(var_name, keep_token_names=False)
-            for var_name, var_specs in self._variables.items()
-            if var_specs.get("reference", None) == "activity"
-        ]
+        # Determine references of activity and capacity variables.
+        activities = self._activities
         reference_activity = reference_activity or _get_reference(
             self._df["reference_variable"], activities
         )
-        capacities = [
-            _var_pattern(var_name, keep_token_names=False)
-            for var_name, var_specs in self._variables.items()
-            if var_specs.get("reference", None) == "capacity"
-        ]
+        capacities = self._capacities
         reference_capacity = reference_capacity or _get_reference(
             self._df["reference_variable"], capacities
         )
@@ -690,7 +748,7 @@ class TEDF:
         )
 
         # Drop rows with failed mappings.
-        mapped = mapped.dropna(subset="value").reset_index(drop=True)
+        mapped = mapped.dropna(subset="value", ignore_index=True)
 
         # Get dict of variables and corresponding reference variables.
         ref_vars = (
@@ -833,26 +891,30 @@ class TEDF:
                         f"Field ID in argument 'agg' must be a "
                         f"string but found: {a}"
                     )
-                if not any(a == col_id for col_id in self._fields):
+                if a not in self._fields:
                     raise Exception(
                         f"Field ID in argument 'agg' is not a valid field: {a}"
                     )
 
         # Aggregate over component fields.
+        agg_set = frozenset(agg)
+        agg_components = agg_set.intersection(component_fields)
         group_cols = [
             c
             for c in selected.columns
-            if not (c == "value" or (c in agg and c in component_fields))
+            if not (c == "value" or c in agg_components)
         ]
         aggregated = (
-            selected.groupby(group_cols, dropna=False)
-            .agg({"value": "sum"})
+            selected.groupby(
+                group_cols, dropna=False, sort=False, observed=True
+            )["value"]
+            .sum()
             .reset_index()
         )
 
         # Aggregate over cases fields.
         group_cols = [
-            c for c in aggregated.columns if not (c == "value" or c in agg)
+            c for c in aggregated.columns if not (c == "value" or c in agg_set)
         ]
         ret = []
         for keys, rows in aggregated.groupby(group_cols, dropna=False):
@@ -867,23 +929,9 @@ class TEDF:
             # Drop all rows with weights equal to nan.
             rows.dropna(subset="weight", inplace=True)
 
+            # Add to return list.
             if not rows.empty:
-                # Aggregate with weights.
-                out = rows.groupby(group_cols, dropna=False)[
-                    ["value", "weight"]
-                ].apply(
-                    lambda cols: pd.Series(
-                        {
-                            "value": np.average(
-                                cols["value"],
-                                weights=cols["weight"],
-                            ),
-                        }
-                    )
-                )
-
-                # Add to return list.
-                ret.append(out)
+                ret.append(rows)
 
         # If nothing is found, return empty dataframe.
         if not ret:
@@ -895,7 +943,17 @@ class TEDF:
             return pd.DataFrame(
                 columns=group_cols + ["variable", "value", "unit"] + add_cols
             )
-        aggregated = pd.concat(ret).reset_index()
+
+        # Aggregate with weights across all groups at once.
+        weighted = pd.concat(ret, ignore_index=True)
+        weighted["value"] *= weighted["weight"]
+        sums = weighted.groupby(group_cols, dropna=False)[
+            ["value", "weight"]
+        ].sum()
+        if (sums["weight"] == 0.0).any():
+            raise ZeroDivisionError("Weights sum to zero, can't be normalized")
+        aggregated = (sums["value"] / sums["weight"]).rename("value")
+        aggregated = aggregated.reset_index()
 
         # Finalise dataframe and return.
         return self._finalise(
@@ -919,29 +977,28 @@ class TEDF:
         # Append reference variables.
         if any(isinstance(v, str) and v for v in ref_vars.values()):
             if append_references:
-                var_ref_unique = {
-                    ref_vars[var]
-                    for var in df["variable"].unique()
-                    if not pd.isnull(ref_vars[var])
-                }
-                to_append = []
-                for ref_var in var_ref_unique:
-                    to_append.append(
-                        pd.DataFrame(
-                            {
-                                "variable": [ref_var],
-                                "value": [1.0],
-                            }
-                            | {
-                                col_id: ["*"]
-                                for col_id, field in self._fields.items()
-                                if col_id in df
-                            }
-                        )
-                    )
+                var_ref_unique = list(
+                    {
+                        ref_vars[var]
+                        for var in df["variable"].unique()
+                        if not pd.isnull(ref_vars[var])
+                    }
+                )
 
-                if to_append:
-                    to_append = pd.concat(to_append, ignore_index=True)
+                # Build all rows to append in one dataframe rather than
+                # concatenating one single-row dataframe per reference.
+                if var_ref_unique:
+                    to_append = pd.DataFrame(
+                        {
+                            "variable": var_ref_unique,
+                            "value": 1.0,
+                        }
+                        | {
+                            col_id: "*"
+                            for col_id in self._fields
+                            if col_id in df
+                        }
+                    )
                     for col_id, field in self._fields.items():
                         if col_id not in df.columns:
                             continue
@@ -950,10 +1007,12 @@ class TEDF:
                             col_id,
                             df[col_id].unique().tolist(),
                         )
-                    df = (
-                        pd.concat([df, to_append], ignore_index=True)
-                        .sort_values(by=group_cols + ["variable"])
-                        .reset_index(drop=True)
+                    df = pd.concat(
+                        [df, to_append],
+                        ignore_index=True,
+                    ).sort_values(
+                        by=group_cols + ["variable"],
+                        ignore_index=True,
                     )
             else:
                 df["reference_variable"] = df["variable"].map(ref_vars)
@@ -971,6 +1030,7 @@ class TEDF:
             df["variable"] = self._parent_variable + "|" + df["variable"]
 
         # Order columns.
-        df = df[[col for col in self._columns if col in df]]
+        df_cols = frozenset(df.columns)
+        df = df[[col for col in self._columns if col in df_cols]]
 
         return df
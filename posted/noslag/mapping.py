@@ -7,12 +7,29 @@ NOSLAG processing of a TEDF.
 
 from abc import ABC, abstractmethod
 from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
 from warnings import warn
 
 import pandas as pd
 
 from posted import POSTEDWarning, databases
 
+# Mapper classes loaded from mapping files keyed by path, together with the
+# modification time of the file when it was loaded.
+_mappings_cache: dict[Path, tuple[int, list[type]]] = {}
+
+
+def _match_any(
+    s: pd.Series, patterns: list[str], full: bool = False
+) -> pd.Series:
+    # Match all patterns in a single pass by combining them into one.
+    if not patterns:
+        return pd.Series(False, index=s.index)
+    pattern = "|".join(f"(?:{p})" for p in patterns)
+    if full:
+        return s.str.fullmatch(pattern, na=False)
+    return s.str.match(pattern, na=False)
+
 
 class AbstractVariableMapper(ABC):
     """Abstract class for defining variable mappings.
@@ -111,11 +128,14 @@ class AbstractVariableGroupMapper(AbstractVariableMapper):
             return self._df
         self._prepare_units()
         df = self._df.copy()
+
+        # Most groups are not affected by a mapping, so these are skipped
+        # based on the raw array before slicing any pandas objects.
+        cond_values = cond.to_numpy(dtype=bool)
         for idx in self._groups:
-            group_cond = cond.loc[idx]
-            if not group_cond.any():
+            if not cond_values[idx].any():
                 continue
-            df.loc[idx] = self._map(df.loc[idx], group_cond)
+            df.loc[idx] = self._map(df.loc[idx], cond.loc[idx])
         return df.where(cond, other=self._df)
 
 
@@ -177,6 +197,13 @@ def _load_mappings(
         if not mapping_path.is_file():
             raise FileNotFoundError(f"Mapping {mapping} could not be found.")
 
+        # Reuse mappers loaded before unless the file has changed since.
+        mtime = mapping_path.stat().st_mtime_ns
+        cached = _mappings_cache.get(mapping_path)
+        if cached is not None and cached[0] == mtime:
+            ret.extend(cached[1])
+            continue
+
         spec = spec_from_file_location(mapping, mapping_path)
         module = module_from_spec(spec)
         spec.loader.exec_module(module)
@@ -197,6 +224,7 @@ def _load_mappings(
         elif len(ret_file) > 2:
             raise ValueError(f"More than one mapper defined in {mapping}.py")
 
+        _mappings_cache[mapping_path] = (mtime, ret_file)
         ret.extend(ret_file)
 
     return ret
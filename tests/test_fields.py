@@ -0,0 +1,69 @@
+"""Tests for field definitions."""
+
+import unittest
+
+
+class TestsFields(unittest.TestCase):
+    """Tests for field definitions."""
+
+    def test_period_select_without_group_columns(self):
+        """Test selecting periods when no columns are left for grouping.
+
+        Rows of a dataframe with only a period and a value column form a
+        single group, so values are still matched, interpolated, and
+        extrapolated.
+        """
+        import pandas as pd
+
+        from posted._columns.fields import PeriodFieldDefinition, PeriodMode
+
+        field = PeriodFieldDefinition(name="Period", description="")
+        df = pd.DataFrame({"period": ["2020", "2030"], "value": [1.0, 3.0]})
+
+        expected = {
+            PeriodMode.NONE: {2020: 1.0},
+            PeriodMode.INTERPOLATE: {2020: 1.0, 2025: 2.0},
+            PeriodMode.EXTRAPOLATE: {2020: 1.0, 2040: 3.0},
+            PeriodMode.INTER_AND_EXTRAPOLATION: {
+                2020: 1.0,
+                2025: 2.0,
+                2040: 3.0,
+            },
+        }
+        for period_mode, values in expected.items():
+            with self.subTest(period_mode=period_mode):
+                selected = field.select_and_expand(
+                    df=df.copy(),
+                    col_id="period",
+                    field_vals=[2020, 2025, 2040],
+                    period_mode=period_mode,
+                )
+                self.assertEqual(
+                    dict(zip(selected["period"], selected["value"])),
+                    values,
+                )
+
+    def test_period_select_empty(self):
+        """Test selecting periods from an empty dataframe."""
+        import pandas as pd
+
+        from posted._columns.fields import PeriodFieldDefinition, PeriodMode
+
+        field = PeriodFieldDefinition(name="Period", description="")
+        df = pd.DataFrame(
+            {
+                "source": pd.Series(dtype=str),
+                "period": pd.Series(dtype=str),
+                "value": pd.Series(dtype=float),
+            }
+        )
+
+        selected = field.select_and_expand(
+            df=df,
+            col_id="period",
+            field_vals=[2025],
+            period_mode=PeriodMode.INTER_AND_EXTRAPOLATION,
+        )
+
+        self.assertTrue(selected.empty)
+        self.assertEqual(list(selected.columns), ["source", "period", "value"])
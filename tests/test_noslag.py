@@ -61,3 +61,43 @@ class TestsNOSLAG(unittest.TestCase):
         )
 
         assert not error_msg, error_msg
+
+    def test_mask_where_order(self):
+        """Test that mask 'where' conditions are checked in order.
+
+        Conditions after the first failing one are not evaluated, so they may
+        refer to columns that were dropped from the dataframe.
+        """
+        import pandas as pd
+
+        from posted.noslag import Mask
+
+        df = pd.DataFrame({"a": ["x", "x"]})
+        mask = Mask(where=["a=='y'", "c=='z'"])
+
+        self.assertFalse(mask.matches(df))
+
+    def test_normalise_cache_invalidation(self):
+        """Test that cached normalised data is not reused when stale.
+
+        Normalised data must be recomputed after the raw data is updated or
+        the default currency is changed.
+        """
+        from posted import TEDF, defaults
+
+        tedf = TEDF.load("Tech|Electrolysis")
+        self.assertGreater(len(tedf.normalise()), 2)
+
+        # Change the default currency.
+        currency = defaults["currency"]
+        try:
+            defaults["currency"] = "USD_2020"
+            units = tedf.normalise()["unit"].dropna()
+        finally:
+            defaults["currency"] = currency
+        self.assertTrue(units.str.contains("USD_2020").any())
+        self.assertFalse(units.str.contains(currency).any())
+
+        # Update the raw data.
+        tedf.update_data(tedf.raw.iloc[:2])
+        self.assertEqual(len(tedf.normalise()), 2)